@@ -0,0 +1,277 @@
+# benchmark.py
+# =================================================================
+# Load-test and benchmark harness for the /api action dispatcher.
+# Seeds a synthetic dataset, drives realistic exam-time action mixes through the Flask test
+# client (or a running server via --base-url) and prints a JSON report with p50/p95/p99
+# latency, throughput and SQL statement counts per action.
+#
+#   python benchmark.py --students-per-class 40 --results 20000 --output bench.json
+#
+# Seeding drops and recreates every table, so it refuses to touch a database that already holds
+# data unless --reset is given; pass --no-seed to benchmark against the existing rows instead.
+# =================================================================
+
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+SCENARIOS = ('login_storm', 'quiz_start', 'submit_burst', 'dashboard_refresh')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seed a synthetic dataset and benchmark the /api actions.")
+    parser.add_argument('--database-url', default=os.environ.get('BENCH_DATABASE_URL', f"sqlite:///{os.path.join(tempfile.gettempdir(), 'quiz_bench.db')}"))
+    parser.add_argument('--base-url', help="Drive a running server (e.g. local gunicorn) instead of the test client; SQL counts are then unavailable.")
+    parser.add_argument('--no-seed', action='store_true', help="Reuse the data already in the database.")
+    parser.add_argument('--reset', action='store_true', help="Allow seeding to drop and recreate the tables of a database that already holds data.")
+    parser.add_argument('--classes', type=int, default=6)
+    parser.add_argument('--students-per-class', type=int, default=40)
+    parser.add_argument('--quizzes', type=int, default=10)
+    parser.add_argument('--questions', type=int, default=20)
+    parser.add_argument('--results', type=int, default=5000)
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help="Repeatable; defaults to all scenarios.")
+    parser.add_argument('--requests', type=int, default=200, help="Requests per scenario.")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--admin-id', default='benchadmin', help="Admin used for dashboard scenarios (created when seeding).")
+    parser.add_argument('--admin-password', default='bench')
+    parser.add_argument('--rate-limit', action='store_true', help="Keep the login rate limiter on (every test-client request shares one client address).")
+    parser.add_argument('--output', help="Write the JSON report here instead of stdout.")
+    return parser.parse_args(argv)
+
+
+# --- Synthetic Dataset ---
+def database_in_use(db):
+    """True if the database has tables the app doesn't own, or any of its own tables holds rows."""
+    from sqlalchemy import inspect
+    existing = set(inspect(db.engine).get_table_names())
+    if existing - set(db.metadata.tables): return True
+    return any(db.session.query(table.select().exists()).scalar() for table in db.metadata.sorted_tables if table.name in existing)
+
+
+def seed_dataset(main, args, rng):
+    db = main.db
+    if not args.reset and database_in_use(db):
+        sys.exit(f"benchmark: {args.database_url.split('://', 1)[0]} database is not empty; pass --reset to drop and reseed it, or --no-seed to reuse it.")
+    db.drop_all()
+    db.create_all()
+    classes = [f"Class {i + 1}" for i in range(args.classes)]
+    participants = [{"class_name": c, "roll": str(r + 1), "name": f"Student {c} {r + 1}", "pin": f"{rng.randint(0, 9999):04d}"} for c in classes for r in range(args.students_per_class)]
+    db.session.execute(db.insert(main.Participant), participants)
+    db.session.add(main.Club(club_id='CLUB01', club_name='Bench Club'))
+    admin = main.Admin(admin_id=args.admin_id, name='Bench Admin', role='SuperAdmin')
+    admin.set_password(args.admin_password)
+    db.session.add(admin)
+    quizzes, questions = [], []
+    for i in range(args.quizzes):
+        quiz_id = f"QZB{i:04d}"
+        quizzes.append({"quiz_id": quiz_id, "quiz_title": f"Bench Quiz {i}", "club_id": 'CLUB01', "status": 'Active', "assigned_classes": 'All', "time_limit_minutes": 10})
+        for j in range(args.questions):
+            questions.append({"question_id": f"QNB{i:04d}_{j:03d}", "quiz_id": quiz_id, "question_text": f"Question {j}?", "option_a": 'A', "option_b": 'B', "option_c": 'C', "option_d": 'D', "correct_answer": rng.choice('ABCD')})
+    db.session.execute(db.insert(main.Quiz), quizzes)
+    db.session.execute(db.insert(main.QuizClass), [{"quiz_id": q['quiz_id'], "class_name": 'All'} for q in quizzes])
+    db.session.execute(db.insert(main.Question), questions)
+    db.session.commit()
+    # Results go through the app's own writer so the derived tables are populated as in production.
+    now = datetime.datetime.utcnow()
+    batch = []
+    for _ in range(args.results):
+        p, quiz = rng.choice(participants), rng.choice(quizzes)
+        answers = {f"QNB{quiz['quiz_id'][3:]}_{j:03d}": rng.choice('ABCD') for j in range(args.questions)}
+        key = main.answer_key_cache.get(quiz['quiz_id'])
+        batch.append({"result_id": main.new_id('RES'), "quiz_id": quiz['quiz_id'], "student_roll": p['roll'], "student_class": p['class_name'], "score": main.score_answers(key, answers), "total_questions": key['total'], "timestamp": now - datetime.timedelta(minutes=rng.randint(0, 60 * 24 * 90)), "submitted_answers": json.dumps(answers)})
+        if len(batch) == 1000:
+            main.write_results(batch)
+            db.session.commit()
+            batch = []
+    if batch:
+        main.write_results(batch)
+        db.session.commit()
+    return {"participants": participants, "quizzes": quizzes, "questions": args.questions}
+
+
+def load_dataset(main):
+    participants = [{"class_name": p.class_name, "roll": p.roll, "pin": p.pin} for p in main.Participant.query.all()]
+    quizzes = [{"quiz_id": q.quiz_id} for q in main.Quiz.query.filter_by(status='Active').all()]
+    return {"participants": participants, "quizzes": quizzes, "questions": None}
+
+
+# --- Scenarios ---
+def scenario_calls(name, dataset, count, rng):
+    """Yield (action, payload, principal) for one scenario; principal is a participant, 'admin' or None.
+
+    A list of such tuples is a sequence that one client runs in order (e.g. start an attempt, then submit).
+    """
+    participants, quizzes = dataset['participants'], dataset['quizzes']
+    for _ in range(count):
+        p, quiz = rng.choice(participants), rng.choice(quizzes)
+        if name == 'login_storm':
+            yield 'studentLogin', {"className": p['class_name'], "roll": p['roll'], "pin": p['pin']}, None
+        elif name == 'quiz_start':
+            yield 'getActiveQuizzes', {"className": p['class_name'], "studentRoll": p['roll']}, p
+            yield 'getQuizDetails', {"quizId": quiz['quiz_id']}, p
+        elif name == 'submit_burst':
+            answers = {f"QNB{quiz['quiz_id'][3:]}_{j:03d}": rng.choice('ABCD') for j in range(dataset['questions'] or 0)}
+            student = {"quizId": quiz['quiz_id'], "studentRoll": p['roll'], "studentClass": p['class_name']}
+            yield [('startQuizAttempt', student, p), ('submitQuiz', {**student, "answers": answers}, p)]
+        elif name == 'dashboard_refresh':
+            yield 'getAdminDashboardData', {"paged": True}, 'admin'
+            yield 'getQuizResultAnalysis', {"quizId": quiz['quiz_id']}, 'admin'
+
+
+class QueryCounter:
+    """Counts SQL statements per thread via SQLAlchemy engine events."""
+    def __init__(self):
+        self._local = threading.local()
+
+    def install(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        event.listen(Engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args):
+        self._local.count = getattr(self._local, 'count', 0) + 1
+
+    def reset(self):
+        self._local.count = 0
+
+    def value(self):
+        return getattr(self._local, 'count', 0)
+
+
+def make_caller(main, args, counter):
+    """Return call(action, payload, token) -> (status, sql_count, json_body)."""
+    if args.base_url:
+        def call(action, payload, token=None):
+            headers = {'Content-Type': 'application/json', **({'Authorization': f"Bearer {token}"} if token else {})}
+            req = urllib.request.Request(args.base_url.rstrip('/') + '/api', data=json.dumps({"action": action, "payload": payload}).encode(), headers=headers)
+            try:
+                with urllib.request.urlopen(req) as resp:
+                    body = resp.read()
+                    return resp.status, None, json.loads(body) if resp.headers.get_content_type() == 'application/json' else None
+            except urllib.error.HTTPError as e:
+                return e.code, None, None
+        return call
+    local = threading.local()
+    def call(action, payload, token=None):
+        if not hasattr(local, 'client'): local.client = main.app.test_client()
+        counter.reset()
+        resp = local.client.post('/api', json={"action": action, "payload": payload}, headers={'Authorization': f"Bearer {token}"} if token else {})
+        resp.get_data()
+        return resp.status_code, counter.value(), resp.get_json(silent=True)
+    return call
+
+
+class TokenBook:
+    """Signs principals in once (outside the timed section) and reuses their session tokens."""
+    def __init__(self, call, args):
+        self.call, self.args = call, args
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def token_for(self, principal):
+        if principal is None: return None
+        key = 'admin' if principal == 'admin' else (principal['class_name'], principal['roll'])
+        with self._lock: token = self._tokens.get(key)
+        if token: return token
+        if principal == 'admin':
+            status, _, body = self.call('adminLogin', {"adminId": self.args.admin_id, "password": self.args.admin_password})
+        else:
+            status, _, body = self.call('studentLogin', {"className": principal['class_name'], "roll": principal['roll'], "pin": principal['pin']})
+        token = body['data']['token'] if status == 200 and body else None
+        with self._lock: self._tokens[key] = token
+        return token
+
+
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile.
+    if not sorted_values: return None
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def run_scenario(name, calls, call, tokens, concurrency):
+    samples = []
+    lock = threading.Lock()
+
+    def timed(item):
+        for action, payload, principal in (item if isinstance(item, list) else [item]):
+            token = tokens.token_for(principal)
+            start = time.perf_counter()
+            status, queries, _ = call(action, payload, token)
+            elapsed = time.perf_counter() - start
+            with lock: samples.append((action, elapsed, status, queries))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, calls))
+    duration = time.perf_counter() - started
+
+    actions = {}
+    for action in sorted({s[0] for s in samples}):
+        rows = [s for s in samples if s[0] == action]
+        latencies = sorted(s[1] * 1000 for s in rows)
+        queries = [s[3] for s in rows if s[3] is not None]
+        actions[action] = {
+            "count": len(rows), "errors": sum(1 for s in rows if s[2] >= 400),
+            "p50_ms": round(percentile(latencies, 50), 3), "p95_ms": round(percentile(latencies, 95), 3), "p99_ms": round(percentile(latencies, 99), 3),
+            "mean_ms": round(sum(latencies) / len(latencies), 3), "max_ms": round(latencies[-1], 3),
+            "queries_mean": round(sum(queries) / len(queries), 2) if queries else None, "queries_max": max(queries) if queries else None,
+        }
+    return {
+        "requests": len(samples), "errors": sum(1 for s in samples if s[2] >= 400), "duration_s": round(duration, 3),
+        "throughput_rps": round(len(samples) / duration, 2) if duration else None, "actions": actions,
+    }
+
+
+def main_entry(argv=None):
+    args = parse_args(argv)
+    # main.py reads DATABASE_URL at import time.
+    os.environ['DATABASE_URL'] = args.database_url
+    if not args.rate_limit: os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import main
+
+    rng = random.Random(args.seed)
+    counter = QueryCounter()
+    with main.app.app_context():
+        dataset = load_dataset(main) if args.no_seed else seed_dataset(main, args, rng)
+        if dataset['questions'] is None:
+            dataset['questions'] = main.Question.query.filter_by(quiz_id=dataset['quizzes'][0]['quiz_id']).count() if dataset['quizzes'] else 0
+    if not args.base_url: counter.install()
+
+    call = make_caller(main, args, counter)
+    tokens = TokenBook(call, args)
+    report = {
+        "meta": {
+            "started": datetime.datetime.utcnow().isoformat() + 'Z', "python": platform.python_version(),
+            "database": args.database_url.split('://', 1)[0], "target": args.base_url or 'test_client',
+            "concurrency": args.concurrency, "requests_per_scenario": args.requests, "seed": args.seed,
+            "dataset": {"classes": args.classes, "students_per_class": args.students_per_class, "quizzes": args.quizzes, "questions": args.questions, "results": args.results, "seeded": not args.no_seed},
+        },
+        "scenarios": {},
+    }
+    for name in args.scenario or SCENARIOS:
+        calls = list(scenario_calls(name, dataset, args.requests, rng))
+        report['scenarios'][name] = run_scenario(name, calls, call, tokens, args.concurrency)
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f: f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main_entry()